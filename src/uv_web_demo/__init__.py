@@ -5,6 +5,9 @@ from datetime import timedelta
 from flask import Flask
 
 from .app_config import AppConfig
+from .book_stats import BookStats
+from .db import DB
+from .janitor import janitor
 from .log_config import init_log_config
 from .util import JsonResult
 from .route.auth import auth_bp
@@ -25,6 +28,17 @@ def create_app(config_mode: str = 'development'):
     app_logger.info(f'App config mode: {config_mode}')
     flask_app.config.from_object(app_config.config_dict[config_mode])
 
+    # 初始化数据库结构并启动后台清理线程
+    DB.init_schema()
+    if BookStats.needs_rebuild():
+        app_logger.warning('Book stats need backfill, run: flask --app src.uv_web_demo.app rebuild-book-stats')
+    janitor.start(flask_app.static_folder)
+
+    # 重建书籍统计：flask --app src.uv_web_demo.app rebuild-book-stats
+    @flask_app.cli.command('rebuild-book-stats')
+    def rebuild_book_stats():
+        BookStats.rebuild()
+
     # 注册蓝图
     flask_app.register_blueprint(auth_bp)
     flask_app.register_blueprint(book_bp)
@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime
+
+from .app_config import AppConfig
+from .db import DB
+from .util import cal_word_count
+
+app_logger = logging.getLogger(AppConfig.PROJECT_NAME + "." + __name__)
+
+
+class BookStats:
+    """
+    书籍统计（章节数、字数、最后更新时间）
+
+    t_book_stats 随章节的增删改增量维护，页面读取时无需再对 t_book_chapter 做聚合。
+    update_datetime 表示章节最后一次变更的时间；回填旧数据时没有章节变更记录，
+    用书籍的更新时间作为初始值，之后重建不会再改写。
+    """
+
+    # 回填完成后写入 PRAGMA user_version，启动和页面判断时无需扫描章节表
+    BACKFILL_VERSION = 1
+
+    @staticmethod
+    def apply_delta(conn, book_id: int, chapter_delta: int, word_delta: int):
+        """在调用方的事务中累加某本书的统计"""
+        conn.execute(
+            """
+            INSERT INTO t_book_stats (book_id, chapter_count, word_count, update_datetime)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (book_id) DO UPDATE
+                SET chapter_count   = chapter_count + excluded.chapter_count,
+                    word_count      = word_count + excluded.word_count,
+                    update_datetime = excluded.update_datetime
+            """,
+            (book_id, chapter_delta, word_delta, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        )
+
+    @staticmethod
+    def delete(conn, book_id: int):
+        """在调用方的事务中删除某本书的统计"""
+        conn.execute("DELETE FROM t_book_stats WHERE book_id = ?", (book_id,))
+
+    @staticmethod
+    def library_totals() -> dict:
+        return DB.query(
+            """
+            SELECT COUNT(*)                          AS book_count,
+                   COALESCE(SUM(s.chapter_count), 0) AS chapter_count,
+                   COALESCE(SUM(s.word_count), 0)    AS word_count,
+                   MAX(s.update_datetime)            AS update_datetime
+            FROM t_book AS b
+                     LEFT JOIN t_book_stats AS s ON s.book_id = b.id
+            """
+        )[0]
+
+    @staticmethod
+    def needs_rebuild() -> bool:
+        """旧数据中的章节还没有字数，需要回填"""
+        return DB.query("PRAGMA user_version")[0]['user_version'] < BookStats.BACKFILL_VERSION
+
+    @staticmethod
+    def rebuild():
+        """重新计算所有章节的字数，并根据章节表重建 t_book_stats"""
+        with DB.transaction(immediate=True) as conn:
+            word_counts = [
+                (cal_word_count(row['content']), row['id'])
+                for row in conn.execute("SELECT id, content FROM t_book_chapter")
+            ]
+            conn.executemany("UPDATE t_book_chapter SET word_count = ? WHERE id = ?", word_counts)
+
+            conn.execute("DELETE FROM t_book_stats WHERE book_id NOT IN (SELECT id FROM t_book)")
+            conn.execute(
+                """
+                INSERT INTO t_book_stats (book_id, chapter_count, word_count, update_datetime)
+                SELECT b.id,
+                       COUNT(c.id),
+                       COALESCE(SUM(c.word_count), 0),
+                       b.update_datetime
+                FROM t_book AS b
+                         LEFT JOIN t_book_chapter AS c ON c.book_id = b.id
+                WHERE true
+                GROUP BY b.id
+                ON CONFLICT (book_id) DO UPDATE
+                    SET chapter_count   = excluded.chapter_count,
+                        word_count      = excluded.word_count,
+                        update_datetime = COALESCE(t_book_stats.update_datetime, excluded.update_datetime)
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {BookStats.BACKFILL_VERSION}")
+        app_logger.info(f'Rebuilt book stats, chapters: {len(word_counts)}')
@@ -1,4 +1,6 @@
 import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
 
 from .app_config import ProductionConfig
 
@@ -35,3 +37,61 @@ class DB:
             return [dict(row) for row in rows]
         finally:
             conn.close()
+
+    @staticmethod
+    @contextmanager
+    def transaction(immediate: bool = False):
+        """
+        开启一个事务，正常退出时提交，发生异常时回滚
+
+        immediate=True 时使用 BEGIN IMMEDIATE，在第一条读语句之前就拿到写锁，
+        适用于先读后写、写入依赖读取结果的场景。
+        """
+        conn = DB.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def init_schema():
+        """初始化数据库结构（可重复执行）"""
+        # sqlite3.connect 会在文件不存在时创建一个空库，先检查，避免留下空文件
+        if not Path(DB_PATH).is_file():
+            raise RuntimeError(f'数据库文件不存在: {Path(DB_PATH).resolve()}')
+
+        conn = DB.get_connection()
+        try:
+            # WAL 模式下后台清理的写事务不会阻塞读请求
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+
+        # 多个 worker 同时启动时，用写锁保证检查和建表串行执行
+        with DB.transaction(immediate=True) as conn:
+            tables = {row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            missing_tables = {'t_book', 't_book_chapter'} - tables
+            if missing_tables:
+                raise RuntimeError(f'数据库 {Path(DB_PATH).resolve()} 缺少表: {", ".join(sorted(missing_tables))}')
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_book_chapter_book_id ON t_book_chapter (book_id)")
+
+            chapter_columns = [row['name'] for row in conn.execute("PRAGMA table_info(t_book_chapter)")]
+            if 'word_count' not in chapter_columns:
+                conn.execute("ALTER TABLE t_book_chapter ADD COLUMN word_count INTEGER")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS t_book_stats
+                (
+                    book_id         INTEGER PRIMARY KEY,
+                    chapter_count   INTEGER NOT NULL DEFAULT 0,
+                    word_count      INTEGER NOT NULL DEFAULT 0,
+                    update_datetime TEXT
+                )
+                """
+            )
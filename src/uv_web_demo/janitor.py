@@ -0,0 +1,132 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .app_config import AppConfig
+from .db import DB
+
+app_logger = logging.getLogger(AppConfig.PROJECT_NAME + "." + __name__)
+
+
+class Janitor:
+    """
+    后台清理线程
+
+    删除书籍时只在事务中删除 t_book 记录，失去父记录的章节视为已删除，
+    由本线程分批清理；封面等文件也放到这里异步删除。
+    队列只保存在内存中，启动时会扫描一次遗留的孤儿章节和没有被任何书籍引用的封面文件，
+    补上进程退出时还没执行完的任务；之后定期扫描孤儿章节，兜底重试耗尽的清理任务。
+    """
+
+    # 每批删除的章节数，单个写事务尽量短，避免长时间占用写锁
+    CHAPTER_PURGE_BATCH = 500
+    # 封面先落盘再写入 t_book，最近修改过的文件可能正在上传，扫描时跳过
+    COVER_SWEEP_GRACE_SECONDS = 10 * 60
+    # 孤儿章节的定期扫描间隔
+    ORPHAN_SWEEP_INTERVAL_SECONDS = 10 * 60
+    # 数据库被锁时的重试次数，每次等待 RETRY_BASE_SECONDS * 2^n 秒
+    MAX_RETRIES = 5
+    RETRY_BASE_SECONDS = 2
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, static_folder: str):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='janitor', daemon=True)
+            self._thread.start()
+        self._submit(self._sweep_orphan_chapters)
+        self._submit(self._sweep_orphan_covers, Path(static_folder))
+
+    def purge_book_chapters(self, book_id: int):
+        self._submit(self._purge_book_chapters, book_id)
+
+    def remove_file(self, path: Path):
+        self._submit(self._remove_file, path)
+
+    def _submit(self, task, *args, attempt: int = 0):
+        self._queue.put((task, args, attempt))
+
+    def _run(self):
+        next_sweep = time.monotonic() + Janitor.ORPHAN_SWEEP_INTERVAL_SECONDS
+        while True:
+            if time.monotonic() >= next_sweep:
+                self._submit(self._sweep_orphan_chapters)
+                next_sweep = time.monotonic() + Janitor.ORPHAN_SWEEP_INTERVAL_SECONDS
+            try:
+                task, args, attempt = self._queue.get(timeout=max(next_sweep - time.monotonic(), 0))
+            except queue.Empty:
+                continue
+            try:
+                task(*args)
+            except sqlite3.OperationalError as e:
+                if attempt < Janitor.MAX_RETRIES:
+                    delay = Janitor.RETRY_BASE_SECONDS * 2 ** attempt
+                    app_logger.warning(f'Janitor task {task.__name__}{args} failed: {e}, retry in {delay}s')
+                    timer = threading.Timer(delay, self._submit, args=(task, *args), kwargs={'attempt': attempt + 1})
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    app_logger.exception(f'Janitor task {task.__name__}{args} failed after {attempt} retries: {e}')
+            except Exception as e:
+                app_logger.exception(f'Janitor task {task.__name__}{args} failed: {e}')
+            finally:
+                self._queue.task_done()
+
+    def _sweep_orphan_chapters(self):
+        orphan_book_ids = DB.query(
+            """
+            SELECT DISTINCT book_id
+            FROM t_book_chapter
+            WHERE book_id NOT IN (SELECT id FROM t_book)
+            """
+        )
+        for row in orphan_book_ids:
+            self._purge_book_chapters(row['book_id'])
+
+    def _sweep_orphan_covers(self, static_folder: Path):
+        covers_dir = static_folder / 'assets' / 'covers'
+        if not covers_dir.is_dir():
+            return
+        cover_paths = {
+            row['cover_image_path']
+            for row in DB.query("SELECT cover_image_path FROM t_book WHERE cover_image_path IS NOT NULL")
+        }
+        deadline = time.time() - Janitor.COVER_SWEEP_GRACE_SECONDS
+        for path in covers_dir.iterdir():
+            if not path.is_file() or path.stat().st_mtime > deadline:
+                continue
+            if path.relative_to(static_folder).as_posix() not in cover_paths:
+                self._remove_file(path)
+
+    def _purge_book_chapters(self, book_id: int):
+        total = 0
+        while True:
+            with DB.transaction(immediate=True) as conn:
+                deleted = conn.execute(
+                    """
+                    DELETE FROM t_book_chapter
+                    WHERE id IN (SELECT id FROM t_book_chapter WHERE book_id = ? LIMIT ?)
+                    """,
+                    (book_id, Janitor.CHAPTER_PURGE_BATCH)
+                ).rowcount
+            total += deleted
+            if deleted < Janitor.CHAPTER_PURGE_BATCH:
+                break
+        app_logger.info(f'Purged {total} chapters of book: {book_id}')
+
+    @staticmethod
+    def _remove_file(path: Path):
+        if path.exists():
+            path.unlink()
+            app_logger.info(f'Removed file: {path}')
+
+
+janitor = Janitor()
@@ -4,10 +4,12 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, abort
 
 from ..app_config import AppConfig
+from ..book_stats import BookStats
 from ..db import DB
+from ..janitor import janitor
 from ..util import login_required, ChapterUtil, cal_content_hash
 
 book_bp = Blueprint('book', __name__)
@@ -25,9 +27,13 @@ def book():
 
     books = DB.query(
         """
-        SELECT *
-        FROM t_book
-        ORDER BY id DESC
+        SELECT a.*,
+               s.chapter_count,
+               s.word_count,
+               s.update_datetime AS stats_update_datetime
+        FROM t_book AS a
+                 LEFT JOIN t_book_stats AS s ON s.book_id = a.id
+        ORDER BY a.id DESC
         LIMIT ? OFFSET ?
         """,
         (per_page, offset)
@@ -36,7 +42,7 @@ def book():
     total_pages = (total + per_page - 1) // per_page
 
     return render_template(
-        'book.html', books=books, page=page, total_pages=total_pages
+        'book.html', books=books, page=page, total_pages=total_pages, stats_ready=not BookStats.needs_rebuild()
     )
 
 
@@ -52,14 +58,18 @@ def book_table(book_id):
 
 @book_bp.get('/book_chapter/<int:chapter_id>/')
 def book_chapter(chapter_id):
-    chapter = DB.query(
+    chapters = DB.query(
         """
         SELECT a.*,
                b.title as book_title
         FROM t_book_chapter as a
-                 LEFT JOIN t_book as b ON a.book_id = b.id
+                 JOIN t_book as b ON a.book_id = b.id
         WHERE a.id = ?
-        """, [chapter_id])[0]
+        """, [chapter_id])
+    # 所属书籍已删除、等待后台清理的章节
+    if not chapters:
+        abort(404)
+    chapter = chapters[0]
     app_logger.debug(f'chapter: {chapter}')
 
     book_chapters = DB.query(
@@ -148,7 +158,8 @@ def book_edit(book_id):
 
         # 处理章节内容
         chapters_text = request.form.get('chapters', '').strip()
-        save_chapters(book_id, chapters_text)
+        if not save_chapters(book_id, chapters_text):
+            abort(404)
 
         flash("Book updated successfully!", "success")
         return redirect(url_for('book.book'))
@@ -165,98 +176,127 @@ def book_edit(book_id):
 @book_bp.post('/book/delete/<int:book_id>')
 @login_required
 def book_delete(book_id):
-    book_cover_path = DB.query("SELECT cover_image_path FROM t_book WHERE id=?", (book_id,))[0]['cover_image_path']
-    if book_cover_path:
-        cover_abs_path = Path(current_app.static_folder) / book_cover_path
-        if cover_abs_path.exists():
-            try:
-                cover_abs_path.unlink()
-            except Exception as e:
-                app_logger.exception(f"Failed to delete cover file {cover_abs_path}: {e}")
-
-    DB.execute("DELETE FROM t_book WHERE id=?", (book_id,))
-    DB.execute("DELETE FROM t_book_chapter WHERE book_id=?", (book_id,))
+    # 只删除书籍记录，章节和封面文件交给后台线程清理
+    with DB.transaction(immediate=True) as conn:
+        book_entity = conn.execute("SELECT cover_image_path FROM t_book WHERE id=?", (book_id,)).fetchone()
+        if book_entity is None:
+            abort(404)
+        conn.execute("DELETE FROM t_book WHERE id=?", (book_id,))
+        BookStats.delete(conn, book_id)
+
+    janitor.purge_book_chapters(book_id)
+    if book_entity['cover_image_path']:
+        janitor.remove_file(Path(current_app.static_folder) / book_entity['cover_image_path'])
+
     flash("Book deleted successfully!", "success")
     return redirect(url_for('book.book'))
 
 
-def save_chapters(book_id, chapters_text):
+def save_chapters(book_id, chapters_text) -> bool:
+    """保存章节并更新统计，书籍已被删除时不做任何修改，返回 False"""
     saved_chapter_ids = []
     if chapters_text:
         chapters = ChapterUtil.generate_chapters(book_id, chapters_text)
 
-        chapter_ids = set([c.get('chapter_id') for c in chapters if c.get('chapter_id') is not None])
-        db_chapters = DB.query("SELECT id, book_id, content_hash FROM t_book_chapter WHERE book_id = ?", (book_id,))
-        db_chapter_ids = set([c.get('id') for c in db_chapters])
-        db_chapters_map = {c.get('id'): c.get('content_hash') for c in db_chapters}
-
-        deleted_chapter_ids = db_chapter_ids - chapter_ids
-
-        if deleted_chapter_ids:
-            placeholders = ','.join(['?'] * len(deleted_chapter_ids))
-            sql = f"DELETE FROM t_book_chapter WHERE id IN ({placeholders})"
-            DB.execute(sql, tuple(deleted_chapter_ids))
-            app_logger.debug(f"Deleted chapters: {deleted_chapter_ids}")
-
-        # 批量插入章节
-        for chapter in chapters:
-            # 数据库已存在的章节
-            if chapter.get('chapter_id'):
-                # 根据 hash 判断是否需要更新
-                content_hash = chapter.get('content_hash')
-                if content_hash != db_chapters_map[chapter.get('chapter_id')]:
-                    DB.execute(
-                        "UPDATE t_book_chapter SET content_hash=?, chapter=?, chapter_title=?, content=?, order_index=? WHERE id=?",
-                        (
-                            chapter.get('content_hash'),
-                            chapter.get('chapter'), chapter.get('chapter_title'),
-                            chapter.get('content'), chapter.get('order_index'), chapter.get('chapter_id')
+        # 先拿写锁再读取，保证统计增量基于事务内的数据计算
+        with DB.transaction(immediate=True) as conn:
+            if conn.execute("SELECT 1 FROM t_book WHERE id = ?", (book_id,)).fetchone() is None:
+                return False
+
+            chapter_ids = set([c.get('chapter_id') for c in chapters if c.get('chapter_id') is not None])
+            db_chapters = conn.execute(
+                "SELECT id, book_id, content_hash, word_count FROM t_book_chapter WHERE book_id = ?", (book_id,)
+            ).fetchall()
+            db_chapter_ids = set([c['id'] for c in db_chapters])
+            db_chapters_map = {c['id']: c['content_hash'] for c in db_chapters}
+            db_word_count_map = {c['id']: c['word_count'] or 0 for c in db_chapters}
+
+            deleted_chapter_ids = db_chapter_ids - chapter_ids
+
+            # 统计增量，随章节变更一起提交
+            chapter_delta = 0
+            word_delta = 0
+            changed = bool(deleted_chapter_ids)
+
+            if deleted_chapter_ids:
+                placeholders = ','.join(['?'] * len(deleted_chapter_ids))
+                sql = f"DELETE FROM t_book_chapter WHERE id IN ({placeholders}) RETURNING word_count"
+                deleted_chapters = conn.execute(sql, tuple(deleted_chapter_ids)).fetchall()
+                chapter_delta -= len(deleted_chapters)
+                word_delta -= sum(c['word_count'] or 0 for c in deleted_chapters)
+                app_logger.debug(f"Deleted chapters: {deleted_chapter_ids}")
+
+            # 批量插入章节
+            for chapter in chapters:
+                # 数据库已存在的章节
+                if chapter.get('chapter_id'):
+                    # 根据 hash 判断是否需要更新
+                    content_hash = chapter.get('content_hash')
+                    if content_hash != db_chapters_map[chapter.get('chapter_id')]:
+                        conn.execute(
+                            "UPDATE t_book_chapter SET content_hash=?, chapter=?, chapter_title=?, content=?, order_index=?, word_count=? WHERE id=?",
+                            (
+                                chapter.get('content_hash'),
+                                chapter.get('chapter'), chapter.get('chapter_title'),
+                                chapter.get('content'), chapter.get('order_index'), chapter.get('word_count'),
+                                chapter.get('chapter_id')
+                            )
                         )
-                    )
-                    app_logger.info(f'Update chapter: {chapter.get("chapter_id")}')
-                saved_chapter_ids.append(chapter.get('chapter_id'))
-            else:
-                # 新的章节
-                cur_chapter_id = DB.execute(
-                    """
-                    INSERT INTO t_book_chapter (book_id, chapter, chapter_title, content, order_index, content_hash)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        chapter['book_id'], chapter['chapter'], chapter['chapter_title'],
-                        chapter['content'], chapter['order_index'], chapter['content_hash']
-                    )
-                )
-                saved_chapter_ids.append(cur_chapter_id)
-                app_logger.info(f'Add new chapter: {cur_chapter_id}')
-
-        if len(chapters) > 1:
-            for i, chapter_id in enumerate(saved_chapter_ids):
-                if i == 0:
-                    DB.execute(
-                        """
-                        UPDATE t_book_chapter
-                        SET next_id = ?
-                        where id = ?
-                        """,
-                        (saved_chapter_ids[i + 1], chapter_id)
-                    )
-                elif i == len(saved_chapter_ids) - 1:
-                    DB.execute(
-                        """
-                        UPDATE t_book_chapter
-                        SET prev_id = ?
-                        where id = ?
-                        """,
-                        (saved_chapter_ids[i - 1], chapter_id)
-                    )
+                        word_delta += chapter.get('word_count') - db_word_count_map[chapter.get('chapter_id')]
+                        changed = True
+                        app_logger.info(f'Update chapter: {chapter.get("chapter_id")}')
+                    saved_chapter_ids.append(chapter.get('chapter_id'))
                 else:
-                    DB.execute(
+                    # 新的章节
+                    cur_chapter_id = conn.execute(
                         """
-                        UPDATE t_book_chapter
-                        SET prev_id = ?,
-                            next_id = ?
-                        where id = ?
+                        INSERT INTO t_book_chapter (book_id, chapter, chapter_title, content, order_index, content_hash,
+                                                    word_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
                         """,
-                        (saved_chapter_ids[i - 1], saved_chapter_ids[i + 1], chapter_id)
-                    )
+                        (
+                            chapter['book_id'], chapter['chapter'], chapter['chapter_title'],
+                            chapter['content'], chapter['order_index'], chapter['content_hash'],
+                            chapter['word_count']
+                        )
+                    ).lastrowid
+                    chapter_delta += 1
+                    changed = True
+                    word_delta += chapter['word_count']
+                    saved_chapter_ids.append(cur_chapter_id)
+                    app_logger.info(f'Add new chapter: {cur_chapter_id}')
+
+            if len(chapters) > 1:
+                for i, chapter_id in enumerate(saved_chapter_ids):
+                    if i == 0:
+                        conn.execute(
+                            """
+                            UPDATE t_book_chapter
+                            SET next_id = ?
+                            where id = ?
+                            """,
+                            (saved_chapter_ids[i + 1], chapter_id)
+                        )
+                    elif i == len(saved_chapter_ids) - 1:
+                        conn.execute(
+                            """
+                            UPDATE t_book_chapter
+                            SET prev_id = ?
+                            where id = ?
+                            """,
+                            (saved_chapter_ids[i - 1], chapter_id)
+                        )
+                    else:
+                        conn.execute(
+                            """
+                            UPDATE t_book_chapter
+                            SET prev_id = ?,
+                                next_id = ?
+                            where id = ?
+                            """,
+                            (saved_chapter_ids[i - 1], saved_chapter_ids[i + 1], chapter_id)
+                        )
+
+            if changed:
+                BookStats.apply_delta(conn, book_id, chapter_delta, word_delta)
+    return True
@@ -3,6 +3,7 @@ import logging
 from flask import Blueprint, render_template, session
 
 from ..app_config import AppConfig
+from ..book_stats import BookStats
 from ..db import DB
 from ..util import login_required
 
@@ -30,4 +31,21 @@ def dashboard():
     username = 'anonymous'
     if s_user:
         username = s_user.get('username')
-    return render_template('dashboard.html', username=username)
+
+    totals = BookStats.library_totals()
+    book_stats = DB.query(
+        """
+        SELECT a.id,
+               a.title,
+               COALESCE(s.chapter_count, 0) AS chapter_count,
+               COALESCE(s.word_count, 0)    AS word_count,
+               s.update_datetime
+        FROM t_book AS a
+                 LEFT JOIN t_book_stats AS s ON s.book_id = a.id
+        ORDER BY s.update_datetime DESC
+        """
+    )
+    return render_template(
+        'dashboard_home.html', username=username, totals=totals, book_stats=book_stats,
+        stats_ready=not BookStats.needs_rebuild()
+    )
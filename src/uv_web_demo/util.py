@@ -81,6 +81,7 @@ class ChapterUtil:
             content = (c.get('content') or '').strip()
             chapter_title = (c.get('chapter_title') or '').strip()
             content_hash = cal_content_hash(chapter_num, chapter_title, order_index, content)
+            word_count = cal_word_count(content)
             chapter_id = c.get('chapter_id')
             if chapter_id:
                 chapter_id = int(chapter_id)
@@ -93,6 +94,7 @@ class ChapterUtil:
                     'content': content,
                     'order_index': order_index,
                     'content_hash': content_hash,
+                    'word_count': word_count,
                 })
         return chapters
 
@@ -110,4 +112,9 @@ def login_required(f):
 
 def cal_content_hash(chapter_num, chapter_title, order_index, content) -> str:
     hash_text = f'{chapter_num}{chapter_title}{order_index}{content}'
-    return hashlib.md5(hash_text.encode('utf-8')).hexdigest()
\ No newline at end of file
+    return hashlib.md5(hash_text.encode('utf-8')).hexdigest()
+
+
+def cal_word_count(content) -> int:
+    """统计字数（不计空白字符）"""
+    return sum(1 for ch in content or '' if not ch.isspace())